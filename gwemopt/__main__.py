@@ -0,0 +1,8 @@
+"""
+Entry point for running gwemopt with python -m gwemopt
+"""
+
+from gwemopt.run import run
+
+if __name__ == "__main__":
+    run()
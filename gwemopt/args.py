@@ -3,8 +3,41 @@ Module for parsing command line arguments
 """
 
 import argparse
+import warnings
 
-from gwemopt.paths import CATALOG_DIR, DEFAULT_LIGHTCURVE_DIR
+import numpy as np
+
+from gwemopt.paths import CATALOG_DIR, DEFAULT_LIGHTCURVE_DIR, SKYMAP_CACHE_DIR
+
+
+def str_list(value: str) -> list[str]:
+    """
+    Parse a comma-separated string into a list of strings
+
+    :param value: comma-separated string
+    :return: list of strings
+    """
+    return value.split(",")
+
+
+def float_array(value: str) -> np.ndarray:
+    """
+    Parse a comma-separated string into an array of floats
+
+    :param value: comma-separated string
+    :return: array of floats
+    """
+    # np.fromstring drops or misreads empty fields, so reject them here
+    if any(not field.strip() for field in value.split(",")):
+        raise ValueError(f"Could not parse {value!r} as floats")
+
+    # Malformed input only warns (and truncates) in current NumPy versions
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(value, sep=",")
+        except DeprecationWarning as exc:
+            raise ValueError(f"Could not parse {value!r} as floats") from exc
 
 
 def parse_args(args):
@@ -16,6 +49,18 @@ def parse_args(args):
 
     parser.add_argument("-o", "--outputDir", help="output directory", default=None)
     parser.add_argument("-e", "--event", help="event name", default=None)
+    parser.add_argument(
+        "--cacheSkymap",
+        action=argparse.BooleanOptionalAction,
+        help="cache parsed skymaps between runs in --skymapCacheDir. Entries are "
+        "never evicted, so delete that directory to clear them",
+        default=True,
+    )
+    parser.add_argument(
+        "--skymapCacheDir",
+        help="skymap cache directory, which can be deleted to clear the cache",
+        default=SKYMAP_CACHE_DIR,
+    )
 
     parser.add_argument("--doCoverage", action="store_true", default=False)
 
@@ -62,21 +107,28 @@ def parse_args(args):
     )
     parser.add_argument("--mag", help="mag.", default=-16, type=float)
     parser.add_argument("--dmag", help="dmag.", default=0.0, type=float)
-    parser.add_argument("-t", "--telescopes", help="Telescope names.", default="ATLAS")
+    parser.add_argument(
+        "-t", "--telescopes", help="Telescope names.", type=str_list, default="ATLAS"
+    )
     parser.add_argument(
         "-d",
         "--coverageFiles",
         help="Telescope coverage files.",
+        type=str_list,
         default=None,
     )
     parser.add_argument(
         "-l",
         "--lightcurveFiles",
         help="Lightcurve files.",
-        default=DEFAULT_LIGHTCURVE_DIR.joinpath("Me2017_H4M050V20.dat"),
+        type=str_list,
+        default=str(DEFAULT_LIGHTCURVE_DIR.joinpath("Me2017_H4M050V20.dat")),
     )
     parser.add_argument(
-        "--observedTiles", help="Tiles that have already been observed.", default=""
+        "--observedTiles",
+        help="Tiles that have already been observed.",
+        type=str_list,
+        default="",
     )
     parser.add_argument("--Ninj", default=10000, type=int)
     parser.add_argument("--Ntiles", default=10, type=int)
@@ -84,7 +136,7 @@ def parse_args(args):
     parser.add_argument("--Ndet", default=1, type=int)
     parser.add_argument("--nside", default=256, type=int)
     parser.add_argument("--DScale", default=1.0, type=float)
-    parser.add_argument("--Tobs", default="0.0,1.0")
+    parser.add_argument("--Tobs", type=float_array, default="0.0,1.0")
 
     parser.add_argument("--mindiff", default=0.0, type=float)
 
@@ -100,6 +152,7 @@ def parse_args(args):
     parser.add_argument(
         "--treasuremap_status",
         help="Status of Treasure Map observations to be queried.",
+        type=str_list,
         default="planned,completed",
     )
 
@@ -109,7 +162,7 @@ def parse_args(args):
     parser.add_argument("-a", "--airmass", default=2.5, type=float)
 
     parser.add_argument("--doSingleExposure", action="store_true", default=False)
-    parser.add_argument("--filters", default="r,g,r")
+    parser.add_argument("--filters", type=str_list, default="r,g,r")
     parser.add_argument("--doAlternatingFilters", action="store_true", default=False)
     parser.add_argument("--doRASlices", action="store_true", default=False)
     parser.add_argument("--nside_down", default=2, type=int)
@@ -118,7 +171,7 @@ def parse_args(args):
     parser.add_argument("--maximumOverlap", default=1.0, type=float)
     parser.add_argument("--doBalanceExposure", action="store_true", default=False)
 
-    parser.add_argument("--exposuretimes", default="30.0,30.0,30.0")
+    parser.add_argument("--exposuretimes", type=float_array, default="30.0,30.0,30.0")
 
     parser.add_argument("--max_nb_tiles", default=None, type=int)
     parser.add_argument("--doReferences", action="store_true", default=False)
@@ -138,7 +191,7 @@ def parse_args(args):
     parser.add_argument("--Nblocks", default=4, type=int)
 
     parser.add_argument("--doRASlice", action="store_true", default=False)
-    parser.add_argument("--raslice", default="0.0,24.0")
+    parser.add_argument("--raslice", type=float_array, default="0.0,24.0")
 
     parser.add_argument("--absmag", default=-15.0, type=float)
 
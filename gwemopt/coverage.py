@@ -7,7 +7,6 @@ from astropy.coordinates import SkyCoord, get_sun
 from astropy.time import Time
 from tqdm import tqdm
 
-import gwemopt.plotting
 import gwemopt.scheduler
 import gwemopt.tiles
 from gwemopt.io.schedule import read_schedule
@@ -14,14 +14,93 @@ from gwemopt.io.export_efficiency import (
 )
 
 
-def compute_efficiency(params, map_struct, lightcurve_struct, coverage_struct):
+def get_coverage_index(coverage_struct):
+    """
+    Map each pixel to the sorted indexes of the coverage entries that contain it
+    """
+    n_coverage = len(coverage_struct["ipix"])
+    if n_coverage == 0:
+        return {}
+
+    pixels = np.concatenate(
+        [np.asarray(ipix, dtype=int) for ipix in coverage_struct["ipix"]]
+    )
+    entries = np.repeat(
+        np.arange(n_coverage), [len(ipix) for ipix in coverage_struct["ipix"]]
+    )
+
+    # Sort by pixel, then by coverage entry, dropping repeated pixels in an entry
+    keys = np.unique(pixels * n_coverage + entries)
+    pixels, entries = keys // n_coverage, keys % n_coverage
+
+    unique_pixels, starts = np.unique(pixels, return_index=True)
+    return dict(zip(unique_pixels.tolist(), np.split(entries, starts[1:])))
+
+
+def get_distance_thresholds(params, lightcurve_struct, coverage_struct):
+    """
+    Maximum distance (in Mpc) at which the lightcurve is detected by each
+    coverage entry. Entries where the lightcurve is undefined, including
+    filters it does not cover, are set to -inf.
+    """
+    gpstime = params["gpstime"]
+    mjd_inj = Time(gpstime, format="gps", scale="utc").mjd
+
+    mjds = coverage_struct["data"][:, 2]
+    mags = coverage_struct["data"][:, 3]
+    filts = np.asarray(coverage_struct["filters"]).flatten()
+
+    lightcurve_t = lightcurve_struct["t"] + mjd_inj
+    dist_thresholds = np.full(len(mjds), -np.inf)
+    for filt in np.unique(filts):
+        if filt not in lightcurve_struct:
+            continue
+        mask = filts == filt
+        lightcurve_mag = lightcurve_struct[filt]
+        idx = np.where(np.isfinite(lightcurve_mag))[0]
+        if len(idx) < 2:
+            continue
+
+        f = interp.interp1d(
+            lightcurve_t[idx], lightcurve_mag[idx], fill_value="extrapolate"
+        )
+        lightcurve_mag_interp = f(mjds[mask])
+        dist_thresholds[mask] = (
+            10 ** (((mags[mask] - lightcurve_mag_interp) / 5.0) + 1.0)
+        ) / 1e6
+
+    dist_thresholds[np.isnan(dist_thresholds)] = -np.inf
+
+    return dist_thresholds
+
+
+def compute_efficiencies(params, map_struct, lightcurve_structs, coverage_struct):
+    """
+    Compute the efficiency of each lightcurve, sharing the coverage lookups
+    """
+    coverage_index = get_coverage_index(coverage_struct)
+
+    efficiency_structs = {}
+    for key, lightcurve_struct in lightcurve_structs.items():
+        efficiency_structs[key] = compute_efficiency(
+            params,
+            map_struct,
+            lightcurve_struct,
+            coverage_struct,
+            coverage_index=coverage_index,
+        )
+
+    return efficiency_structs
+
+
+def compute_efficiency(
+    params, map_struct, lightcurve_struct, coverage_struct, coverage_index=None
+):
     nside = params["nside"]
     npix = hp.nside2npix(nside)
 
     Ninj = params["Ninj"]
     Ndet = params["Ndet"]
-    gpstime = params["gpstime"]
-    mjd_inj = Time(gpstime, format="gps", scale="utc").mjd
 
     if params["catalog"] is not None:
         distn = scipy.stats.rv_discrete(
@@ -32,41 +111,25 @@ def compute_efficiency(params, map_struct, lightcurve_struct, coverage_struct):
     ipix = distn.rvs(size=Ninj)
     ras, decs = hp.pix2ang(nside, ipix, lonlat=True)
 
-    dists = np.logspace(-1, 3, 1000)
-    ndetections = np.zeros((len(dists),))
-
-    for pinpoint in ipix:
-        idxs = []
-        for jj in range(len(coverage_struct["ipix"])):
-            expPixels = coverage_struct["ipix"][jj]
+    if coverage_index is None:
+        coverage_index = get_coverage_index(coverage_struct)
+    dist_thresholds = get_distance_thresholds(
+        params, lightcurve_struct, coverage_struct
+    )
 
-            if pinpoint in expPixels:
-                idxs.append(jj)
-        if len(idxs) == 0:
+    # An injection at a given distance is detected if at least Ndet exposures
+    # reach that distance, i.e. if the Ndet-th largest threshold does
+    ipix_unique, ipix_inverse = np.unique(ipix, return_inverse=True)
+    pixel_thresholds = np.full(len(ipix_unique), -np.inf)
+    for ii, pinpoint in enumerate(ipix_unique):
+        idxs = coverage_index.get(pinpoint)
+        if idxs is None or len(idxs) < Ndet:
             continue
+        pixel_thresholds[ii] = np.sort(dist_thresholds[idxs])[-Ndet]
+    injection_thresholds = np.sort(pixel_thresholds[ipix_inverse])
 
-        mjds = coverage_struct["data"][idxs, 2]
-        mags = coverage_struct["data"][idxs, 3]
-        filts = coverage_struct["filters"][idxs]
-
-        detections = np.zeros((len(dists),))
-
-        for mjd, mag, filt in zip(mjds, mags, filts):
-            lightcurve_t = lightcurve_struct["t"] + mjd_inj
-            lightcurve_mag = lightcurve_struct[filt]
-            idx = np.where(np.isfinite(lightcurve_mag))[0]
-
-            f = interp.interp1d(
-                lightcurve_t[idx], lightcurve_mag[idx], fill_value="extrapolate"
-            )
-            lightcurve_mag_interp = f(mjd)
-            dist_threshold = (10 ** (((mag - lightcurve_mag_interp) / 5.0) + 1.0)) / 1e6
-
-            idxs_detections = np.where(dists <= dist_threshold)[0]
-            detections[idxs_detections] = detections[idxs_detections] + 1
-
-        idxs_detections = np.where(detections >= Ndet)[0]
-        ndetections[idxs_detections] = ndetections[idxs_detections] + 1
+    dists = np.logspace(-1, 3, 1000)
+    ndetections = Ninj - np.searchsorted(injection_thresholds, dists, side="left")
 
     efficiency = ndetections / Ninj
     efficiency_struct = {}
@@ -79,7 +142,11 @@ def compute_efficiency(params, map_struct, lightcurve_struct, coverage_struct):
 
     if params["do_3d"]:
         eff_3D, dists_inj = compute_3d_efficiency(
-            params, map_struct, lightcurve_struct, coverage_struct
+            params,
+            map_struct,
+            lightcurve_struct,
+            coverage_struct,
+            coverage_index=coverage_index,
         )
         efficiency_metric = [eff_3D, np.sqrt(eff_3D * (1 - eff_3D) / params["Ninj"])]
         save_efficiency_metric(
@@ -147,12 +214,12 @@ def compute_true_efficiency(params, map_struct, lightcurve_struct, coverage_stru
     return single_detection
 
 
-def compute_3d_efficiency(params, map_struct, lightcurve_struct, coverage_struct):
+def compute_3d_efficiency(
+    params, map_struct, lightcurve_struct, coverage_struct, coverage_index=None
+):
     nside = params["nside"]
     npix = hp.nside2npix(nside)
     Ninj = params["Ninj"]
-    gpstime = params["gpstime"]
-    mjd_inj = Time(gpstime, format="gps", scale="utc").mjd
 
     if params["catalog"] is not None:
         distn = scipy.stats.rv_discrete(
@@ -167,6 +234,12 @@ def compute_3d_efficiency(params, map_struct, lightcurve_struct, coverage_struct
         map_struct["distmu"], map_struct["distsigma"]
     )
 
+    if coverage_index is None:
+        coverage_index = get_coverage_index(coverage_struct)
+    dist_thresholds = get_distance_thresholds(
+        params, lightcurve_struct, coverage_struct
+    )
+
     detections = 0
     dists_inj = {}
     dists_inj["recovered"], dists_inj["tot"] = [], []
@@ -181,36 +254,11 @@ def compute_3d_efficiency(params, map_struct, lightcurve_struct, coverage_struct
         if dist != np.inf:
             dists_inj["tot"].append(dist)
 
-        idxs = []
-        for jj in range(len(coverage_struct["ipix"])):
-            expPixels = coverage_struct["ipix"][jj]
-
-            if pinpoint in expPixels:
-                idxs.append(jj)
-
-        if len(idxs) == 0:
+        idxs = coverage_index.get(pinpoint)
+        if idxs is None:
             continue
 
-        mjds = coverage_struct["data"][idxs, 2]
-        mags = coverage_struct["data"][idxs, 3]
-        filts = coverage_struct["filters"][idxs]
-        single_detection = False
-        for mjd, mag, filt in zip(mjds, mags, filts):
-            lightcurve_t = lightcurve_struct["t"] + mjd_inj
-            lightcurve_mag = lightcurve_struct[filt]
-            idx = np.where(np.isfinite(lightcurve_mag))[0]
-
-            f = interp.interp1d(
-                lightcurve_t[idx], lightcurve_mag[idx], fill_value="extrapolate"
-            )
-            lightcurve_mag_interp = f(mjd)
-            dist_threshold = (10 ** (((mag - lightcurve_mag_interp) / 5.0) + 1.0)) / 1e6
-
-            if dist <= dist_threshold:
-                single_detection = True
-                break
-
-        if single_detection:
+        if np.any(dist <= dist_thresholds[idxs]):
             detections += 1
             dists_inj["recovered"].append(dist)
 
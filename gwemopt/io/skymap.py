@@ -2,7 +2,9 @@
 Module to fetch event info and skymap from GraceDB, url, or locally
 """
 
+import hashlib
 import os
+import zipfile
 from pathlib import Path
 
 import healpy as hp
@@ -21,7 +23,8 @@ from ligo.skymap.moc import uniq2nest
 from scipy.interpolate import PchipInterpolator
 from scipy.stats import norm
 
-from gwemopt.paths import SKYMAP_DIR
+from gwemopt.paths import SKYMAP_CACHE_DIR, SKYMAP_DIR
+from gwemopt.utils.misc import save_atomically
 
 
 def download_from_url(skymap_url: str, output_dir: Path, skymap_name: str) -> Path:
@@ -213,6 +216,188 @@ def read_inclination(skymap, params, map_struct):
     return map_struct
 
 
+def read_2d_skymap(params, filename):
+    """
+    Read a 2D skymap into a map_struct
+
+    :param params: dictionary of parameters
+    :param filename: path to the skymap
+    :return: map_struct, header
+    """
+    map_struct = {}
+
+    prob_data, header = hp.read_map(filename, field=0, verbose=False, h=True)
+    prob_data = prob_data / np.sum(prob_data)
+
+    map_struct["prob"] = prob_data
+
+    return map_struct, header
+
+
+def read_3d_skymap(params, filename):
+    """
+    Read a 3D skymap, with distance information, into a map_struct
+
+    :param params: dictionary of parameters
+    :param filename: path to the skymap
+    :return: map_struct, header
+    """
+    map_struct = {}
+    header = []
+
+    try:
+        healpix_data, header = hp.read_map(
+            filename, field=(0, 1, 2, 3), verbose=False, h=True
+        )
+    except:
+        skymap = read_sky_map(filename, moc=True, distances=True)
+
+        # for colname in skymap.colnames:
+        #    if colname.startswith('PROB'):
+        #        newname = colname.replace('PROB', 'PROBDENSITY')
+        #        skymap.rename_column(colname, newname)
+        #        skymap[newname] *= len(skymap) / (4 * np.pi)
+        #        skymap[newname].unit = u.steradian ** -1
+
+        if "PROBDENSITY_SAMPLES" in skymap.columns:
+            if params["inclination"]:
+                map_struct = read_inclination(skymap, params, map_struct)
+
+            skymap.remove_columns(
+                [
+                    f"{name}_SAMPLES"
+                    for name in [
+                        "PROBDENSITY",
+                        "DISTMU",
+                        "DISTSIGMA",
+                        "DISTNORM",
+                    ]
+                ]
+            )
+
+        t = rasterize(skymap)
+        result = t["PROB"], t["DISTMU"], t["DISTSIGMA"], t["DISTNORM"]
+        healpix_data = hp.reorder(result, "NESTED", "RING")
+
+    distmu_data = healpix_data[1]
+    distsigma_data = healpix_data[2]
+    prob_data = healpix_data[0]
+    norm_data = healpix_data[3]
+
+    map_struct["distmu"] = distmu_data / params["DScale"]
+    map_struct["distsigma"] = distsigma_data / params["DScale"]
+    map_struct["prob"] = prob_data
+    map_struct["distnorm"] = norm_data
+
+    return map_struct, header
+
+
+def resample_2d_skymap(map_struct, nside):
+    """
+    Resample a 2D map_struct to the requested nside
+
+    :param map_struct: dictionary of map parameters
+    :param nside: target nside
+    :return: map_struct
+    """
+    map_struct["prob"] = hp.ud_grade(map_struct["prob"], nside, power=-2)
+
+    return map_struct
+
+
+def resample_3d_skymap(map_struct, nside):
+    """
+    Resample a 3D map_struct to the requested nside, and compute the
+    distance moments
+
+    :param map_struct: dictionary of map parameters
+    :param nside: target nside
+    :return: map_struct
+    """
+    if hp.pixelfunc.get_nside(map_struct["prob"]) != nside:
+        map_struct["prob"] = hp.pixelfunc.ud_grade(map_struct["prob"], nside, power=-2)
+        map_struct["distmu"] = hp.pixelfunc.ud_grade(map_struct["distmu"], nside)
+        map_struct["distsigma"] = hp.pixelfunc.ud_grade(map_struct["distsigma"], nside)
+        map_struct["distnorm"] = hp.pixelfunc.ud_grade(map_struct["distnorm"], nside)
+
+        map_struct["distmu"][map_struct["distmu"] < -1e30] = np.inf
+
+    nside_down = 32
+
+    distmu_down = hp.pixelfunc.ud_grade(map_struct["distmu"], nside_down)
+
+    (
+        map_struct["distmed"],
+        map_struct["diststd"],
+        mom_norm,
+    ) = ligodist.parameters_to_moments(map_struct["distmu"], map_struct["distsigma"])
+
+    distmu_down[distmu_down < -1e30] = np.inf
+
+    map_struct["distmed"] = hp.ud_grade(map_struct["distmed"], nside, power=-2)
+    map_struct["diststd"] = hp.ud_grade(map_struct["diststd"], nside, power=-2)
+
+    return map_struct
+
+
+def get_skymap_cache_path(params, cache_dir: Path = SKYMAP_CACHE_DIR) -> Path:
+    """
+    Get the cache file for a skymap, keyed on the skymap file and the
+    parameters that change its parsed and resampled content
+
+    :param params: dictionary of parameters
+    :param cache_dir: directory holding the cached skymaps
+    :return: path to the cache file
+    """
+    skymap_path = Path(params["skymap"]).resolve()
+    key = repr(
+        (
+            str(skymap_path),
+            os.path.getmtime(skymap_path),
+            params["nside"],
+            params["do_3d"],
+            params["DScale"],
+        )
+    )
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return cache_dir.joinpath(f"{digest}.npz")
+
+
+def load_cached_skymap(cachefile: Path):
+    """
+    Load a parsed and resampled map_struct from the skymap cache
+
+    :param cachefile: path to the cache file
+    :return: map_struct
+    """
+    with np.load(cachefile) as data:
+        map_struct = {key: data[key] for key in data.files}
+
+    if "prob" not in map_struct:
+        raise KeyError(f"No prob map in {cachefile}")
+
+    if "trigtime" in map_struct:
+        map_struct["trigtime"] = str(map_struct["trigtime"])
+
+    return map_struct
+
+
+def save_cached_skymap(cachefile: Path, map_struct):
+    """
+    Save a parsed and resampled map_struct to the skymap cache. The file is
+    written under a temporary name and moved into place, so that concurrent
+    runs never read a partial cache file.
+
+    :param cachefile: path to the cache file
+    :param map_struct: dictionary of map parameters
+    :return: None
+    """
+    try:
+        save_atomically(cachefile, lambda f: np.savez_compressed(f, **map_struct))
+    except OSError as exc:
+        print(f"Could not cache skymap to {cachefile}: {exc}")
+
+
 def read_skymap(params, map_struct=None):
     """
     Read in a skymap and return a map_struct
@@ -229,6 +414,7 @@ def read_skymap(params, map_struct=None):
         else:
             params["do_3d"] = True
 
+    cachefile = None
     if map_struct is None:
         # Let's just figure out what's in the skymap first
         skymap_path = params["skymap"]
@@ -258,110 +444,47 @@ def read_skymap(params, map_struct=None):
         if "do_3d" not in params:
             params["do_3d"] = is_3d
 
-        header = []
-        if map_struct is None:
-            map_struct = {}
-
-            filename = params["skymap"]
-
-            if params["do_3d"]:
-                try:
-                    healpix_data, header = hp.read_map(
-                        filename, field=(0, 1, 2, 3), verbose=False, h=True
-                    )
-                except:
-                    skymap = read_sky_map(filename, moc=True, distances=True)
-                    order = hp.nside2order(params["nside"])
-
-                    # for colname in skymap.colnames:
-                    #    if colname.startswith('PROB'):
-                    #        newname = colname.replace('PROB', 'PROBDENSITY')
-                    #        skymap.rename_column(colname, newname)
-                    #        skymap[newname] *= len(skymap) / (4 * np.pi)
-                    #        skymap[newname].unit = u.steradian ** -1
-
-                    if "PROBDENSITY_SAMPLES" in skymap.columns:
-                        if params["inclination"]:
-                            map_struct = read_inclination(skymap, params, map_struct)
-
-                        skymap.remove_columns(
-                            [
-                                f"{name}_SAMPLES"
-                                for name in [
-                                    "PROBDENSITY",
-                                    "DISTMU",
-                                    "DISTSIGMA",
-                                    "DISTNORM",
-                                ]
-                            ]
-                        )
-
-                    t = rasterize(skymap)
-                    result = t["PROB"], t["DISTMU"], t["DISTSIGMA"], t["DISTNORM"]
-                    healpix_data = hp.reorder(result, "NESTED", "RING")
-
-                distmu_data = healpix_data[1]
-                distsigma_data = healpix_data[2]
-                prob_data = healpix_data[0]
-                norm_data = healpix_data[3]
-
-                map_struct["distmu"] = distmu_data / params["DScale"]
-                map_struct["distsigma"] = distsigma_data / params["DScale"]
-                map_struct["prob"] = prob_data
-                map_struct["distnorm"] = norm_data
+        # The inclination interpolators cannot be stored in the cache
+        if params.get("cacheSkymap", False) and not params["inclination"]:
+            cache_dir = Path(params.get("skymapCacheDir", SKYMAP_CACHE_DIR))
+            cachefile = get_skymap_cache_path(params, cache_dir)
 
-            else:
-                prob_data, header = hp.read_map(
-                    filename, field=0, verbose=False, h=True
-                )
-                prob_data = prob_data / np.sum(prob_data)
-
-                map_struct["prob"] = prob_data
-
-        for j in range(len(header)):
-            if header[j][0] == "DATE":
-                map_struct["trigtime"] = header[j][1]
-
-    natural_nside = hp.pixelfunc.get_nside(map_struct["prob"])
     nside = params["nside"]
 
-    print("natural_nside =", natural_nside)
-    print("nside =", nside)
-
-    if not params["do_3d"]:
-        map_struct["prob"] = hp.ud_grade(map_struct["prob"], nside, power=-2)
-
     if params["do_3d"]:
-        if natural_nside != nside:
-            map_struct["prob"] = hp.pixelfunc.ud_grade(
-                map_struct["prob"], nside, power=-2
-            )
-            map_struct["distmu"] = hp.pixelfunc.ud_grade(map_struct["distmu"], nside)
-            map_struct["distsigma"] = hp.pixelfunc.ud_grade(
-                map_struct["distsigma"], nside
-            )
-            map_struct["distnorm"] = hp.pixelfunc.ud_grade(
-                map_struct["distnorm"], nside
-            )
-
-            map_struct["distmu"][map_struct["distmu"] < -1e30] = np.inf
-
-        nside_down = 32
+        read_map, resample_map = read_3d_skymap, resample_3d_skymap
+    else:
+        read_map, resample_map = read_2d_skymap, resample_2d_skymap
+
+    cached = False
+    if cachefile is not None and cachefile.is_file():
+        print(f"Loading cached skymap from {cachefile}")
+        try:
+            map_struct = load_cached_skymap(cachefile)
+            cached = True
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile) as exc:
+            # A corrupt or outdated entry is dropped and the skymap read again
+            print(f"Discarding unreadable cached skymap {cachefile}: {exc}")
+            try:
+                cachefile.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    if not cached:
+        if map_struct is None:
+            map_struct, header = read_map(params, params["skymap"])
 
-        distmu_down = hp.pixelfunc.ud_grade(map_struct["distmu"], nside_down)
+            for j in range(len(header)):
+                if header[j][0] == "DATE":
+                    map_struct["trigtime"] = header[j][1]
 
-        (
-            map_struct["distmed"],
-            map_struct["diststd"],
-            mom_norm,
-        ) = ligodist.parameters_to_moments(
-            map_struct["distmu"], map_struct["distsigma"]
-        )
+        print("natural_nside =", hp.pixelfunc.get_nside(map_struct["prob"]))
+        print("nside =", nside)
 
-        distmu_down[distmu_down < -1e30] = np.inf
+        map_struct = resample_map(map_struct, nside)
 
-        map_struct["distmed"] = hp.ud_grade(map_struct["distmed"], nside, power=-2)
-        map_struct["diststd"] = hp.ud_grade(map_struct["diststd"], nside, power=-2)
+        if cachefile is not None:
+            save_cached_skymap(cachefile, map_struct)
 
     npix = hp.nside2npix(nside)
     theta, phi = hp.pix2ang(nside, np.arange(npix))
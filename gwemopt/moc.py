@@ -46,6 +46,12 @@ def create_moc(params, map_struct=None):
                 print("Keeping %d/%d tiles" % (len(idxs), len(tesselation)))
                 tesselation = tesselation[idxs, :]
 
+        if telescope == "ZTF":
+            if params["doUsePrimary"]:
+                tesselation = tesselation[tesselation[:, 0] <= 880]
+            if params["doUseSecondary"]:
+                tesselation = tesselation[tesselation[:, 0] >= 1000]
+
         if params["doParallel"]:
             moclists = Parallel(
                 n_jobs=params["Ncores"],
@@ -59,18 +65,10 @@ def create_moc(params, map_struct=None):
             )
             for ii, tess in tqdm(enumerate(tesselation), total=len(tesselation)):
                 index, ra, dec = tess[0], tess[1], tess[2]
-                if (telescope == "ZTF") and params["doUsePrimary"] and (index > 880):
-                    continue
-                if (telescope == "ZTF") and params["doUseSecondary"] and (index < 1000):
-                    continue
                 moc_struct[index] = moclists[ii]
         else:
             for ii, tess in tqdm(enumerate(tesselation), total=len(tesselation)):
                 index, ra, dec = tess[0], tess[1], tess[2]
-                if (telescope == "ZTF") and params["doUsePrimary"] and (index > 880):
-                    continue
-                if (telescope == "ZTF") and params["doUseSecondary"] and (index < 1000):
-                    continue
                 index = index.astype(int)
                 moc_struct[index] = Fov2Moc(
                     params, config_struct, telescope, ra, dec, nside
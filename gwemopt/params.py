@@ -1,15 +1,176 @@
-import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-import astroplan
 import astropy
 import numpy as np
-from astropy import table, time
+import pandas as pd
+from astropy import time
 from astropy import units as u
 
 import gwemopt
-from gwemopt.paths import CONFIG_DIR, REFS_DIR, TESSELATION_DIR
+from gwemopt.paths import (
+    CONFIG_DIR,
+    REFS_DIR,
+    TESSELATION_CACHE_DIR,
+    TESSELATION_DIR,
+)
 from gwemopt.tiles import TILE_TYPES
+from gwemopt.utils.misc import save_atomically
+
+# Up-to-date tesselation caches already checked by this process, keyed on the
+# tesselation file and cache directory. The lock guards the worker threads
+KNOWN_TESSELATIONS = {}
+KNOWN_TESSELATIONS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=64)
+def get_location(longitude, latitude, elevation):
+    """@Creates the location of a site, reused across calls for the same site
+    @param longitude
+        longitude in degrees
+    @param latitude
+        latitude in degrees
+    @param elevation
+        elevation in metres
+    """
+
+    return astropy.coordinates.EarthLocation(
+        lat=latitude * u.deg, lon=longitude * u.deg, height=elevation * u.m
+    )
+
+
+def read_tesselation(tessfile, cache_dir: Path = TESSELATION_CACHE_DIR):
+    """@Reads a tesselation file, caching the parsed array as a .npy file
+    @param tessfile
+        path to the tesselation file
+    @param cache_dir
+        directory holding the cached tesselations
+    """
+
+    key = (Path(tessfile).absolute(), cache_dir)
+    with KNOWN_TESSELATIONS_LOCK:
+        cache_path = KNOWN_TESSELATIONS.get(key)
+    if cache_path is not None:
+        return np.load(cache_path, mmap_mode="r")
+
+    tessfile = Path(tessfile).resolve()
+    digest = hashlib.sha256(str(tessfile).encode()).hexdigest()[:16]
+    cache_path = cache_dir.joinpath(f"{tessfile.stem}_{digest}.npy")
+
+    if cache_path.is_file() and cache_path.stat().st_mtime >= tessfile.stat().st_mtime:
+        tesselation = np.load(cache_path, mmap_mode="r")
+    else:
+        tesselation = np.loadtxt(tessfile, usecols=(0, 1, 2), comments="%")
+        try:
+            save_atomically(cache_path, lambda f: np.save(f, tesselation))
+        except OSError as exc:
+            print(f"Could not cache tesselation to {cache_path}: {exc}")
+            return tesselation
+
+    with KNOWN_TESSELATIONS_LOCK:
+        KNOWN_TESSELATIONS[key] = cache_path
+
+    return tesselation
+
+
+def read_reference_images(reffile):
+    """@Reads a reference image file into a dictionary of filters per field
+    @param reffile
+        path to the reference image file
+    """
+
+    with open(reffile, "r") as f:
+        header = f.readline()
+    sep = "|" if "|" in header else r"\s+"
+
+    # Skip the separator line below the header and the trailing row count
+    refs = pd.read_csv(
+        reffile,
+        sep=sep,
+        skiprows=[1],
+        usecols=lambda col: col.strip() in ["field", "fid"],
+        skipinitialspace=True,
+        low_memory=False,
+    )
+    refs.columns = refs.columns.str.strip()
+    refs = refs.iloc[:-1].astype(int).drop_duplicates()
+    refs = refs.sort_values(["field", "fid"])
+
+    reference_images_map = {0: "u", 1: "g", 2: "r", 3: "i", 4: "z", 5: "y"}
+    filters = [reference_images_map.get(n, n) for n in refs["fid"].tolist()]
+
+    # Rows are sorted by field, so each field is a contiguous run of rows
+    fields, starts = np.unique(refs["field"].to_numpy(), return_index=True)
+    ends = np.append(starts[1:], len(filters))
+    reference_images = {
+        field: filters[start:end]
+        for field, start, end in zip(fields.tolist(), starts, ends)
+    }
+
+    return reference_images
+
+
+def generate_tesselations(telescopes):
+    """@Generates the missing tesselation files of the telescopes, one file at
+    a time, before their configurations are built concurrently
+    @param telescopes
+        list of telescope names
+    """
+
+    generated = set()
+    for telescope in telescopes:
+        config_file = CONFIG_DIR.joinpath(telescope + ".config")
+        config_struct = gwemopt.utils.readParamsFromFile(config_file)
+        if "tesselationFile" not in config_struct:
+            continue
+
+        # Telescopes can share a tesselation file, which is only written once
+        tessfile = TESSELATION_DIR.joinpath(config_struct["tesselationFile"])
+        if tessfile in generated or tessfile.is_file():
+            continue
+
+        config_struct["tesselationFile"] = tessfile
+        if config_struct["FOV_type"] == "circle":
+            gwemopt.tiles.tesselation_spiral(config_struct)
+        elif config_struct["FOV_type"] == "square":
+            gwemopt.tiles.tesselation_packing(config_struct)
+        else:
+            continue
+        generated.add(tessfile)
+
+
+def get_telescope_config(telescope, opts):
+    """@Creates the configuration structure for a single telescope
+    @param telescope
+        telescope name
+    @param opts
+        gwemopt command line options
+    """
+
+    config_file = CONFIG_DIR.joinpath(telescope + ".config")
+    config_struct = gwemopt.utils.readParamsFromFile(config_file)
+    config_struct["telescope"] = telescope
+    if "tesselationFile" in config_struct:
+        tessfile = TESSELATION_DIR.joinpath(config_struct["tesselationFile"])
+        if opts.tilesType == "galaxy":
+            config_struct["tesselation"] = np.empty((3,))
+        else:
+            config_struct["tesselation"] = read_tesselation(tessfile)
+
+    if "referenceFile" in config_struct:
+        reffile = REFS_DIR.joinpath(config_struct["referenceFile"])
+        config_struct["reference_images"] = read_reference_images(reffile)
+
+    config_struct["location"] = get_location(
+        float(config_struct["longitude"]),
+        float(config_struct["latitude"]),
+        float(config_struct["elevation"]),
+    )
+
+    return config_struct
 
 
 def params_struct(opts):
@@ -18,91 +179,38 @@ def params_struct(opts):
         gwemopt command line options
     """
 
-    telescopes = str(opts.telescopes).split(",")
+    telescopes = opts.telescopes
 
     params = dict(opts.__dict__)
 
-    params["config"] = {}
-    for telescope in telescopes:
-        config_file = CONFIG_DIR.joinpath(telescope + ".config")
-        params["config"][telescope] = gwemopt.utils.readParamsFromFile(config_file)
-        params["config"][telescope]["telescope"] = telescope
-        if opts.doSingleExposure:
-            exposuretime = np.array(opts.exposuretimes.split(","), dtype=float)[0]
-
-            params["config"][telescope]["magnitude_orig"] = params["config"][telescope][
-                "magnitude"
-            ]
-            params["config"][telescope]["exposuretime_orig"] = params["config"][
-                telescope
-            ]["exposuretime"]
-
-            nmag = -2.5 * np.log10(
-                np.sqrt(params["config"][telescope]["exposuretime"] / exposuretime)
-            )
-            params["config"][telescope]["magnitude"] = (
-                params["config"][telescope]["magnitude"] + nmag
-            )
-            params["config"][telescope]["exposuretime"] = exposuretime
-        if "tesselationFile" in params["config"][telescope]:
-            tessfile = TESSELATION_DIR.joinpath(
-                params["config"][telescope]["tesselationFile"]
-            )
-            if not os.path.isfile(tessfile):
-                if params["config"][telescope]["FOV_type"] == "circle":
-                    gwemopt.tiles.tesselation_spiral(params["config"][telescope])
-                elif params["config"][telescope]["FOV_type"] == "square":
-                    gwemopt.tiles.tesselation_packing(params["config"][telescope])
-            if opts.tilesType == "galaxy":
-                params["config"][telescope]["tesselation"] = np.empty((3,))
-            else:
-                params["config"][telescope]["tesselation"] = np.loadtxt(
-                    tessfile, usecols=(0, 1, 2), comments="%"
-                )
-
-        if "referenceFile" in params["config"][telescope]:
-            reffile = REFS_DIR.joinpath(params["config"][telescope]["referenceFile"])
-
-            refs = table.unique(
-                table.Table.read(reffile, format="ascii", data_start=2, data_end=-1)[
-                    "field", "fid"
-                ]
+    generate_tesselations(telescopes)
+
+    max_workers = max(min(len(telescopes), opts.Ncores), 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        config_structs = list(
+            executor.map(
+                lambda telescope: get_telescope_config(telescope, opts), telescopes
             )
-            reference_images = {
-                group[0]["field"]: group["fid"].astype(int).tolist()
-                for group in refs.group_by("field").groups
-            }
-            reference_images_map = {0: "u", 1: "g", 2: "r", 3: "i", 4: "z", 5: "y"}
-            for key in reference_images:
-                reference_images[key] = [
-                    reference_images_map.get(n, n) for n in reference_images[key]
-                ]
-            params["config"][telescope]["reference_images"] = reference_images
-
-        location = astropy.coordinates.EarthLocation(
-            params["config"][telescope]["longitude"],
-            params["config"][telescope]["latitude"],
-            params["config"][telescope]["elevation"],
         )
-        observer = astroplan.Observer(location=location)
-        params["config"][telescope]["observer"] = observer
 
-    params["coverageFiles"] = (
-        opts.coverageFiles.split(",") if opts.coverageFiles else None
-    )
-    params["telescopes"] = telescopes
-    params["lightcurveFiles"] = str(opts.lightcurveFiles).split(",")
+    if opts.doSingleExposure:
+        exposuretime = opts.exposuretimes[0]
 
-    params["Tobs"] = np.array(opts.Tobs.split(","), dtype=float)
-    params["observedTiles"] = opts.observedTiles.split(",")
+        # -2.5 log10(sqrt(t_orig / t)) for all telescopes at once
+        exposuretimes_orig = np.array(
+            [config_struct["exposuretime"] for config_struct in config_structs]
+        )
+        nmags = -1.25 * np.log10(exposuretimes_orig / exposuretime)
 
-    params["treasuremap_status"] = opts.treasuremap_status.split(",")
+        for config_struct, nmag in zip(config_structs, nmags):
+            config_struct["magnitude_orig"] = config_struct["magnitude"]
+            config_struct["exposuretime_orig"] = config_struct["exposuretime"]
+            config_struct["magnitude"] = config_struct["magnitude"] + nmag
+            config_struct["exposuretime"] = exposuretime
 
-    params["raslice"] = np.array(opts.raslice.split(","), dtype=float)
+    params["config"] = dict(zip(telescopes, config_structs))
 
     params["unbalanced_tiles"] = None
-    params["filters"] = opts.filters.split(",")
-    params["exposuretimes"] = np.array(opts.exposuretimes.split(","), dtype=float)
     params["catalogDir"] = Path(opts.catalogDir)
 
     params["ignore_observability"] = (
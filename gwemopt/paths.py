@@ -10,12 +10,14 @@ DEFAULT_LIGHTCURVE_DIR = DATA_DIR.joinpath("lightcurves")
 DEFAULT_BASE_OUTPUT_DIR = Path.home().joinpath("Data/gwemopt/")
 
 TESSELATION_DIR = DATA_DIR.joinpath("tesselations")
+TESSELATION_CACHE_DIR = DEFAULT_BASE_OUTPUT_DIR.joinpath(".tesselation_cache")
 REFS_DIR = DATA_DIR.joinpath("refs")
 CONFIG_DIR = DATA_DIR.joinpath("config")
 TILING_DIR = DATA_DIR.joinpath("tiling")
 
 SKYMAP_DIR = DEFAULT_BASE_OUTPUT_DIR.joinpath("skymaps")
 SKYMAP_DIR.mkdir(exist_ok=True, parents=True)
+SKYMAP_CACHE_DIR = SKYMAP_DIR.joinpath(".skymap_cache")
 
 CATALOG_DIR = DEFAULT_BASE_OUTPUT_DIR.joinpath("catalogs")
 CATALOG_DIR.mkdir(exist_ok=True, parents=True)
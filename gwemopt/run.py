@@ -1,30 +1,74 @@
-import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
 
 import gwemopt.coverage
-import gwemopt.efficiency
 import gwemopt.lightcurve
-import gwemopt.plotting
 import gwemopt.segments
 from gwemopt.args import parse_args
-from gwemopt.catalogs import get_catalog
 from gwemopt.io import get_skymap, read_skymap, summary
 from gwemopt.params import params_struct
 from gwemopt.paths import DEFAULT_BASE_OUTPUT_DIR
-from gwemopt.plotting import (
-    make_coverage_plots,
-    make_efficiency_plots,
-    make_tile_plots,
-    plot_inclination,
-    plot_observability,
-    plot_skymap,
-)
 from gwemopt.utils import calculate_observability
 
 
+def check_observability(args, params, map_struct):
+    """
+    Calculate observability, exiting if it is below threshold for any telescope
+
+    :param args: parsed command line arguments
+    :param params: dictionary of parameters
+    :param map_struct: dictionary of map parameters
+    :return: map_struct
+    """
+    print("Calculating observability")
+    observability_struct = calculate_observability(params, map_struct)
+    map_struct["observability"] = observability_struct
+
+    if args.doObservabilityExit:
+        probs = np.stack(
+            [
+                observability_struct[telescope]["prob"]
+                for telescope in params["telescopes"]
+            ]
+        )
+        prob_sums = probs.sum(axis=1)
+        below_thresh = prob_sums < args.observability_thresh
+
+        if np.any(below_thresh):
+            idx = np.argmax(below_thresh)
+            print(
+                "Observability for %s: %.5f < %.5f... exiting."
+                % (
+                    params["telescopes"][idx],
+                    prob_sums[idx],
+                    args.observability_thresh,
+                )
+            )
+
+            if params["doTrueLocation"]:
+                lightcurve_structs = gwemopt.lightcurve.read_files(
+                    params, params["lightcurveFiles"]
+                )
+                filenames = [
+                    params["outputDir"].joinpath(
+                        "efficiency_true_" + lightcurve_struct["name"] + ".txt"
+                    )
+                    for lightcurve_struct in lightcurve_structs.values()
+                ]
+                with ThreadPoolExecutor() as executor:
+                    list(
+                        executor.map(
+                            lambda filename: filename.write_text("0"), filenames
+                        )
+                    )
+            exit(0)
+
+    return map_struct
+
+
 def run(args=None):
     if args is None:
         args = sys.argv[1:]
@@ -55,64 +99,46 @@ def run(args=None):
     params["outputDir"] = output_dir
     print(f"Output directory: {output_dir}")
 
+    # Unless the catalog replaces the skymap probabilities, check observability
+    # before computing segments or the catalog, in case we exit early
+    use_catalog_prob = params["catalog"] is not None and args.doUseCatalog
+    if args.doObservability and not use_catalog_prob:
+        map_struct = check_observability(args, params, map_struct)
+
     params = gwemopt.segments.get_telescope_segments(params)
 
     print("Loading skymap...")
 
     if params["catalog"] is not None:
+        from gwemopt.catalogs import get_catalog
+
         print("Generating catalog...")
         map_struct, catalog_struct = get_catalog(params, map_struct)
     else:
         catalog_struct = None
 
     if args.doPlots:
+        from gwemopt.plotting import plot_inclination, plot_skymap
+
         print("Plotting skymap...")
         plot_skymap(params, map_struct)
         if args.inclination:
             plot_inclination(params, map_struct)
 
     if args.doObservability:
-        print("Calculating observability")
-        observability_struct = calculate_observability(params, map_struct)
-        map_struct["observability"] = observability_struct
+        if use_catalog_prob:
+            map_struct = check_observability(args, params, map_struct)
         if args.doPlots:
+            from gwemopt.plotting import plot_observability
+
             print("Plotting observability...")
             plot_observability(params, map_struct)
 
-        if args.doObservabilityExit:
-            for telescope in params["telescopes"]:
-                if (
-                    np.sum(observability_struct[telescope]["prob"])
-                    < args.observability_thresh
-                ):
-                    print(
-                        "Observability for %s: %.5f < %.5f... exiting."
-                        % (
-                            telescope,
-                            np.sum(observability_struct[telescope]["prob"]),
-                            args.observability_thresh,
-                        )
-                    )
-
-                    if params["doTrueLocation"]:
-                        lightcurve_structs = gwemopt.lightcurve.read_files(
-                            params, params["lightcurveFiles"]
-                        )
-                        for key in lightcurve_structs.keys():
-                            filename = os.path.join(
-                                params["outputDir"],
-                                "efficiency_true_"
-                                + lightcurve_structs[key]["name"]
-                                + ".txt",
-                            )
-                            fid = open(filename, "w")
-                            fid.write("0")
-                            fid.close()
-                    exit(0)
-
     if params["splitType"] is not None:
+        from gwemopt.mapsplit import similar_range
+
         print("Splitting skymap...")
-        map_struct["groups"] = gwemopt.mapsplit.similar_range(params, map_struct)
+        map_struct["groups"] = similar_range(params, map_struct)
 
     if args.doTiles:
         if params["tilesType"] == "moc":
@@ -125,19 +151,15 @@ def run(args=None):
             print("Generating galaxy struct...")
             tile_structs = gwemopt.tiles.galaxy(params, map_struct, catalog_struct)
             for telescope in params["telescopes"]:
-                params["config"][telescope]["tesselation"] = np.empty((0, 3))
-                tiles_struct = tile_structs[telescope]
-                for index in tiles_struct.keys():
-                    ra, dec = tiles_struct[index]["ra"], tiles_struct[index]["dec"]
-                    params["config"][telescope]["tesselation"] = np.append(
-                        params["config"][telescope]["tesselation"],
-                        [[index, ra, dec]],
-                        axis=0,
-                    )
+                params["config"][telescope]["tesselation"] = (
+                    gwemopt.tiles.tesselation_from_tiles(tile_structs[telescope])
+                )
         else:
             raise ValueError(f"Unknown tilesType: {params['tilesType']}")
 
         if args.doPlots:
+            from gwemopt.plotting import make_tile_plots
+
             print("Plotting tiles struct...")
             make_tile_plots(params, map_struct, tile_structs)
 
@@ -157,6 +179,8 @@ def run(args=None):
         )
 
     if args.doSchedule or args.doCoverage:
+        from gwemopt.plotting import make_coverage_plots
+
         print("Summary of coverage...")
         summary(params, map_struct, coverage_struct, catalog_struct=catalog_struct)
 
@@ -167,6 +191,8 @@ def run(args=None):
 
     if args.doEfficiency:
         if args.doSchedule or args.doCoverage:
+            from gwemopt.efficiency import compute_efficiencies
+
             print("Computing efficiency...")
             if args.modelType == "file":
                 lightcurve_structs = gwemopt.lightcurve.read_files(
@@ -176,16 +202,13 @@ def run(args=None):
                 lightcurve_structs = gwemopt.lightcurve.tophat(
                     params, mag0=args.mag, dmag=args.dmag
                 )
-            efficiency_structs = {}
-            for key in lightcurve_structs.keys():
-                lightcurve_struct = lightcurve_structs[key]
-                efficiency_struct = gwemopt.efficiency.compute_efficiency(
-                    params,
-                    map_struct,
-                    lightcurve_struct,
-                    coverage_struct,
-                )
-                efficiency_structs[key] = efficiency_struct
+            efficiency_structs = compute_efficiencies(
+                params,
+                map_struct,
+                lightcurve_structs,
+                coverage_struct,
+            )
+            for key, lightcurve_struct in lightcurve_structs.items():
                 efficiency_structs[key]["legend_label"] = lightcurve_struct[
                     "legend_label"
                 ]
@@ -196,8 +219,14 @@ def run(args=None):
                     )
 
             if args.doPlots:
+                from gwemopt.plotting import make_efficiency_plots
+
                 print("Plotting efficiency...")
                 make_efficiency_plots(params, map_struct, efficiency_structs)
         else:
             print("Need to enable --doSchedule or --doCoverage for --doEfficiency")
             exit(0)
+
+
+if __name__ == "__main__":
+    run()
@@ -132,11 +132,16 @@ def get_order(
 
         nexps = nexps + tile_struct[key]["nexposures"]
 
-    if "dec_constraint" in config_struct:
+    has_dec_constraint = "dec_constraint" in config_struct
+    if has_dec_constraint:
         dec_constraint = config_struct["dec_constraint"].split(",")
         dec_min = float(dec_constraint[0])
         dec_max = float(dec_constraint[1])
 
+    # Loop invariants, looked up once rather than per exposure and tile
+    mindiff = params["mindiff"] / 86400.0
+    do_mindiff_filt = params.get("doMindifFilt", False)
+
     for ii in range(len(exposurelist)):
         exposureids_tiles[ii] = {}
         exposureids = []
@@ -146,13 +151,13 @@ def get_order(
             tilesegmentlist = tilesegmentlists[jj]
             if tile_struct[key]["prob"] == 0:
                 continue
-            if "dec_constraint" in config_struct:
+            if has_dec_constraint:
                 if (tile_struct[key]["dec"] < dec_min) or (
                     tile_struct[key]["dec"] > dec_max
                 ):
                     continue
             if "epochs" in tile_struct[key]:
-                if params.get("doMindifFilt", False):
+                if do_mindiff_filt:
                     if "epochs_filters" not in tile_struct[key]:
                         tile_struct[key]["epochs_filters"] = []
                     # take into account filter for mindiff
@@ -162,12 +167,12 @@ def get_order(
                     )[0]
                     if np.any(
                         np.abs(exposurelist[ii][0] - tile_struct[key]["epochs"][idx, 2])
-                        < params["mindiff"] / 86400.0
+                        < mindiff
                     ):
                         continue
                 elif np.any(
                     np.abs(exposurelist[ii][0] - tile_struct[key]["epochs"][:, 2])
-                    < params["mindiff"] / 86400.0
+                    < mindiff
                 ):
                     continue
             if tilesegmentlist.intersects_segment(exposurelist[ii]):
@@ -236,9 +241,7 @@ def get_order(
             if idxs[ii] > 0:
                 continue
 
-            exptimecheck = np.where(
-                exposurelist[ii][0] - tileexptime < params["mindiff"] / 86400.0
-            )[0]
+            exptimecheck = np.where(exposurelist[ii][0] - tileexptime < mindiff)[0]
             exptimecheckkeys = [keynames[x] for x in exptimecheck]
 
             # restricted by availability of tile and timeallocation
@@ -276,9 +279,7 @@ def get_order(
     elif params["scheduleType"] == "greedy_slew":
         current_ra, current_dec = np.nan, np.nan
         for ii in np.arange(len(exposurelist)):
-            exptimecheck = np.where(
-                exposurelist[ii][0] - tileexptime < params["mindiff"] / 86400.0
-            )[0]
+            exptimecheck = np.where(exposurelist[ii][0] - tileexptime < mindiff)[0]
             exptimecheckkeys = [keynames[x] for x in exptimecheck]
 
             # find_tile finds the tile that covers the largest probablity
@@ -327,9 +328,7 @@ def get_order(
             ii = iis[0]
             mask = np.where((ii == last_exposure) & (tilenexps > 0))[0]
 
-            exptimecheck = np.where(
-                exposurelist[ii][0] - tileexptime < params["mindiff"] / 86400.0
-            )[0]
+            exptimecheck = np.where(exposurelist[ii][0] - tileexptime < mindiff)[0]
             exptimecheckkeys = [keynames[x] for x in exptimecheck]
 
             if len(mask) > 0:
@@ -368,9 +367,7 @@ def get_order(
             weights = tileprobs[jj] * tilenexps[jj] / tileavailable[jj]
             weights[~np.isfinite(weights)] = 0.0
 
-            exptimecheck = np.where(
-                exposurelist[ii][0] - tileexptime < params["mindiff"] / 86400.0
-            )[0]
+            exptimecheck = np.where(exposurelist[ii][0] - tileexptime < mindiff)[0]
             weights[exptimecheck] = 0.0
 
             if np.any(weights >= 0):
@@ -0,0 +1,195 @@
+import tempfile
+from pathlib import Path
+
+import healpy as hp
+import numpy as np
+import scipy.stats
+from astropy.time import Time
+from ligo.skymap import distance
+from scipy.interpolate import interp1d
+
+from gwemopt.efficiency import compute_3d_efficiency, compute_efficiency
+
+NSIDE = 4
+GPSTIME = 1249852257.0
+
+
+def get_test_inputs(output_dir):
+    """
+    Build a synthetic low-resolution map, coverage and lightcurve
+
+    :param output_dir: directory for the efficiency output files
+    :return: params, map_struct, lightcurve_struct, coverage_struct
+    """
+    rng = np.random.default_rng(0)
+    npix = hp.nside2npix(NSIDE)
+
+    params = {
+        "nside": NSIDE,
+        "Ninj": 500,
+        "Ndet": 1,
+        "gpstime": GPSTIME,
+        "catalog": None,
+        "do_3d": False,
+        "true_location": False,
+        "outputDir": Path(output_dir),
+    }
+
+    prob = rng.random(npix)
+    map_struct = {
+        "prob": prob / np.sum(prob),
+        "distmu": rng.uniform(50.0, 300.0, npix),
+        "distsigma": rng.uniform(20.0, 80.0, npix),
+    }
+
+    t = np.linspace(0.0, 5.0, 20)
+    lightcurve_struct = {
+        "name": "test",
+        "legend_label": "test",
+        "t": t,
+        "g": -16.0 + 0.5 * t,
+        "r": -16.5 + 0.3 * t,
+    }
+
+    # Overlapping exposures in two filters, plus one in a filter the
+    # lightcurve does not cover and which contains no pixels
+    mjd_inj = Time(GPSTIME, format="gps", scale="utc").mjd
+    n_exposures = 30
+    coverage_struct = {
+        "ipix": [
+            rng.choice(npix, size=rng.integers(5, 40), replace=False)
+            for _ in range(n_exposures)
+        ]
+        + [np.array([], dtype=int)],
+        "filters": np.array(["g", "r"] * (n_exposures // 2) + ["J"]),
+    }
+    data = np.zeros((n_exposures + 1, 5))
+    data[:, 2] = mjd_inj + rng.uniform(0.1, 4.0, n_exposures + 1)
+    data[:, 3] = rng.uniform(19.0, 21.5, n_exposures + 1)
+    coverage_struct["data"] = data
+
+    return params, map_struct, lightcurve_struct, coverage_struct
+
+
+def get_reference_thresholds(params, lightcurve_struct, coverage_struct, idxs):
+    """
+    Detection distance of each coverage entry, one entry at a time
+    """
+    mjd_inj = Time(params["gpstime"], format="gps", scale="utc").mjd
+    thresholds = []
+    for jj in idxs:
+        mjd, mag = coverage_struct["data"][jj, 2], coverage_struct["data"][jj, 3]
+        lightcurve_mag = lightcurve_struct[coverage_struct["filters"][jj]]
+        f = interp1d(
+            lightcurve_struct["t"] + mjd_inj, lightcurve_mag, fill_value="extrapolate"
+        )
+        thresholds.append((10 ** (((mag - f(mjd)) / 5.0) + 1.0)) / 1e6)
+    return thresholds
+
+
+def get_covering_entries(coverage_struct, pinpoint):
+    """
+    Indexes of the coverage entries containing a pixel
+    """
+    return [
+        jj
+        for jj, exp_pixels in enumerate(coverage_struct["ipix"])
+        if pinpoint in exp_pixels
+    ]
+
+
+def reference_efficiency(params, map_struct, lightcurve_struct, coverage_struct):
+    """
+    Injection-by-injection efficiency, as computed before vectorisation
+    """
+    npix = hp.nside2npix(params["nside"])
+    distn = scipy.stats.rv_discrete(values=(np.arange(npix), map_struct["prob"]))
+    ipix = distn.rvs(size=params["Ninj"])
+
+    dists = np.logspace(-1, 3, 1000)
+    ndetections = np.zeros((len(dists),))
+    for pinpoint in ipix:
+        idxs = get_covering_entries(coverage_struct, pinpoint)
+        detections = np.zeros((len(dists),))
+        for threshold in get_reference_thresholds(
+            params, lightcurve_struct, coverage_struct, idxs
+        ):
+            detections[dists <= threshold] += 1
+        ndetections[detections >= params["Ndet"]] += 1
+
+    return ndetections / params["Ninj"]
+
+
+def reference_3d_efficiency(params, map_struct, lightcurve_struct, coverage_struct):
+    """
+    Injection-by-injection 3D efficiency, as computed before vectorisation
+    """
+    npix = hp.nside2npix(params["nside"])
+    distn = scipy.stats.rv_discrete(values=(np.arange(npix), map_struct["prob"]))
+    ipix = distn.rvs(size=params["Ninj"])
+
+    mom_mean, mom_std, _ = distance.parameters_to_moments(
+        map_struct["distmu"], map_struct["distsigma"]
+    )
+
+    detections = 0
+    dists_inj = {"recovered": [], "tot": []}
+    for pinpoint in ipix:
+        dist = -1
+        while dist < 0:
+            dist = mom_mean[pinpoint] + mom_std[pinpoint] * np.random.normal()
+        dists_inj["tot"].append(dist)
+
+        idxs = get_covering_entries(coverage_struct, pinpoint)
+        thresholds = get_reference_thresholds(
+            params, lightcurve_struct, coverage_struct, idxs
+        )
+        if any(dist <= threshold for threshold in thresholds):
+            detections += 1
+            dists_inj["recovered"].append(dist)
+
+    return detections / params["Ninj"], dists_inj
+
+
+def test_efficiency():
+    """
+    Test the vectorised efficiency against a per-injection reference
+
+    :return: None
+    """
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        params, map_struct, lightcurve_struct, coverage_struct = get_test_inputs(
+            temp_dir
+        )
+
+        for ndet in [1, 2, 3]:
+            params["Ndet"] = ndet
+
+            np.random.seed(42)
+            expected = reference_efficiency(
+                params, map_struct, lightcurve_struct, coverage_struct
+            )
+            np.random.seed(42)
+            efficiency_struct = compute_efficiency(
+                params, map_struct, lightcurve_struct, coverage_struct
+            )
+
+            assert np.any(expected > 0.0)
+            np.testing.assert_array_equal(efficiency_struct["efficiency"], expected)
+
+        np.random.seed(42)
+        expected_eff, expected_dists = reference_3d_efficiency(
+            params, map_struct, lightcurve_struct, coverage_struct
+        )
+        np.random.seed(42)
+        eff, dists_inj = compute_3d_efficiency(
+            params, map_struct, lightcurve_struct, coverage_struct
+        )
+
+        assert 0.0 < expected_eff < 1.0
+        assert eff == expected_eff
+        np.testing.assert_array_equal(dists_inj["tot"], expected_dists["tot"])
+        np.testing.assert_array_equal(
+            dists_inj["recovered"], expected_dists["recovered"]
+        )
@@ -0,0 +1,63 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from gwemopt.args import parse_args
+from gwemopt.io.skymap import read_skymap
+
+test_dir = Path(__file__).parent.absolute()
+test_data_dir = test_dir.joinpath("data")
+
+test_skymap = test_data_dir.joinpath("S190814bv_5_LALInference.v1.fits.gz")
+
+
+def read_test_skymap(cache_dir, cache_flag):
+    """
+    Read the test skymap with the skymap cache in a given directory
+
+    :param cache_dir: skymap cache directory
+    :param cache_flag: --cacheSkymap or --no-cacheSkymap
+    :return: map_struct
+    """
+    args = parse_args(
+        ["-e", str(test_skymap), cache_flag, "--skymapCacheDir", str(cache_dir)]
+    )
+    params = dict(vars(args))
+    params["skymap"] = test_skymap
+    _, map_struct = read_skymap(params)
+    return map_struct
+
+
+def test_skymap_cache():
+    """
+    Test that cached skymaps match freshly read ones
+
+    :return: None
+    """
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = Path(temp_dir).joinpath("skymap_cache")
+
+        fresh = read_test_skymap(cache_dir, "--no-cacheSkymap")
+        assert not cache_dir.exists()
+
+        first = read_test_skymap(cache_dir, "--cacheSkymap")
+        assert len(list(cache_dir.iterdir())) == 1
+
+        cached = read_test_skymap(cache_dir, "--cacheSkymap")
+        assert len(list(cache_dir.iterdir())) == 1
+
+        # A corrupt entry is replaced by a fresh read
+        (cachefile,) = cache_dir.iterdir()
+        cachefile.write_bytes(b"corrupt")
+        recovered = read_test_skymap(cache_dir, "--cacheSkymap")
+        assert cachefile.read_bytes() != b"corrupt"
+
+        for map_struct in [first, cached, recovered]:
+            assert map_struct.keys() == fresh.keys()
+            for key, value in fresh.items():
+                if isinstance(value, np.ndarray):
+                    np.testing.assert_array_equal(map_struct[key], value)
+                else:
+                    assert map_struct[key] == value
@@ -996,16 +996,18 @@ def absmag_tiles_struct(params, config_struct, telescope, map_struct, tile_struc
             ]
             ranked_tile_times[idx[idy], ii] = config_struct["max_exposure"]
 
+    # Try to load the minimum duration of time from telescope config file
+    # Otherwise set it to zero
+    try:
+        min_obs_duration = config_struct["min_observability_duration"] / 24
+    except:
+        min_obs_duration = 0.0
+
+    use_references = params["doReferences"] and (telescope in ["ZTF", "DECam"])
+
     for key, prob, exposureTime, tileprob in zip(
         keys, ranked_tile_probs, ranked_tile_times, tile_probs
     ):
-        # Try to load the minimum duration of time from telescope config file
-        # Otherwise set it to zero
-        try:
-            min_obs_duration = config_struct["min_observability_duration"] / 24
-        except:
-            min_obs_duration = 0.0
-
         # Check that a given tile is observable a minimum amount of time
         # If not set the proba associated to the tile to zero
         if (
@@ -1032,7 +1034,7 @@ def absmag_tiles_struct(params, config_struct, telescope, map_struct, tile_struc
             tile_struct[key]["nexposures"] = 0
             tile_struct[key]["filt"] = []
         else:
-            if params["doReferences"] and (telescope in ["ZTF", "DECam"]):
+            if use_references:
                 tile_struct[key]["exposureTime"] = []
                 tile_struct[key]["nexposures"] = []
                 tile_struct[key]["filt"] = []
@@ -1171,16 +1173,18 @@ def powerlaw_tiles_struct(
         for ii in range(len(params["exposuretimes"])):
             ranked_tile_times[ranked_tile_probs > 0, ii] = params["exposuretimes"][ii]
 
+        # Try to load the minimum duration of time from telescope config file
+        # Otherwise set it to zero
+        try:
+            min_obs_duration = config_struct["min_observability_duration"] / 24
+        except:
+            min_obs_duration = 0.0
+
+        use_references = params["doReferences"] and (telescope in ["ZTF", "DECam"])
+
         for key, prob, exposureTime, tileprob in zip(
             keys, ranked_tile_probs, ranked_tile_times, tile_probs
         ):
-            # Try to load the minimum duration of time from telescope config file
-            # Otherwise set it to zero
-            try:
-                min_obs_duration = config_struct["min_observability_duration"] / 24
-            except:
-                min_obs_duration = 0.0
-
             # Check that a given tile is observable a minimum amount of time
             # If not set the proba associated to the tile to zero
             if (
@@ -1207,7 +1211,7 @@ def powerlaw_tiles_struct(
                 tile_struct[key]["nexposures"] = 0
                 tile_struct[key]["filt"] = []
             else:
-                if params["doReferences"] and (telescope in ["ZTF", "DECam"]):
+                if use_references:
                     tile_struct[key]["exposureTime"] = []
                     tile_struct[key]["nexposures"] = []
                     tile_struct[key]["filt"] = []
@@ -1242,16 +1246,16 @@ def powerlaw_tiles_struct(
 
         keys = tile_struct.keys()
 
+        # Try to load the minimum duration of time from telescope config file
+        # Otherwise set it to zero
+        try:
+            min_obs_duration = config_struct["min_observability_duration"] / 24
+        except:
+            min_obs_duration = 0.0
+
         for key, prob, exposureTime, tileprob in zip(
             keys, ranked_tile_probs, ranked_tile_times, tile_probs
         ):
-            # Try to load the minimum duration of time from telescope config file
-            # Otherwise set it to zero
-            try:
-                min_obs_duration = config_struct["min_observability_duration"] / 24
-            except:
-                min_obs_duration = 0.0
-
             # Check that a given tile is observable a minimum amount of time
             # If not set the proba associated to the tile to zero
             if (
@@ -1374,7 +1378,9 @@ def pem_tiles_struct(params, config_struct, telescope, map_struct, tile_struct):
     )
 
     if params["doPlots"]:
-        gwemopt.plotting.tauprob(params, tau, prob)
+        from gwemopt.plotting import tauprob
+
+        tauprob(params, tau, prob)
 
     keys = tile_struct.keys()
     for key, prob, exposureTime in zip(keys, ranked_tile_probs, time_allocation):
@@ -1514,3 +1520,17 @@ def tesselation_packing(config_struct, scale=0.97):
     for ii in range(len(ra)):
         fid.write("%d %.5f %.5f\n" % (ii, ra[ii], dec[ii]))
     fid.close()
+
+
+def tesselation_from_tiles(tiles_struct):
+    """
+    Pack the index, ra and dec of each tile into an (N, 3) tesselation array
+    """
+    values = (
+        value
+        for index, tile in tiles_struct.items()
+        for value in (index, tile["ra"], tile["dec"])
+    )
+    tesselation = np.fromiter(values, dtype=float, count=3 * len(tiles_struct))
+
+    return tesselation.reshape(-1, 3)
@@ -1,5 +1,10 @@
 from gwemopt.utils.geometry import angular_distance
-from gwemopt.utils.misc import auto_rasplit, get_exposures, integrationTime
+from gwemopt.utils.misc import (
+    auto_rasplit,
+    get_exposures,
+    integrationTime,
+    save_atomically,
+)
 from gwemopt.utils.observability import calculate_observability
 from gwemopt.utils.param_utils import readParamsFromFile
 from gwemopt.utils.pixels import (
@@ -1,4 +1,7 @@
 import copy
+import os
+import tempfile
+from pathlib import Path
 
 import astropy
 import astropy.coordinates
@@ -10,6 +13,27 @@ import numpy as np
 from astropy.time import Time, TimeDelta
 
 
+def save_atomically(path: Path, save):
+    """
+    Write a file under a temporary name in its directory and move it into
+    place, so that concurrent runs never read a partial file. The temporary
+    file is removed if writing or moving it fails.
+
+    :param path: path of the file to write
+    :param save: function writing the contents to an open binary file
+    :return: None
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(dir=path.parent, suffix=path.suffix, delete=False)
+    try:
+        with f:
+            save(f)
+        os.replace(f.name, path)
+    except BaseException:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+
+
 def auto_rasplit(params, map_struct, nside_down):
     if params["do_3d"]:
         prob_down, distmu_down, distsigma_down, distnorm_down = ligodist.ud_grade(
@@ -19,50 +19,47 @@ def calculate_observability(params, map_struct):
     event_time = Time(gpstime, format="gps", scale="utc")
     dts = np.arange(0, 1, 0.1)
 
+    times = event_time + TimeDelta(dts * u.day)
+
+    # Look up (celestial) spherical polar coordinates of HEALPix grid.
+    theta, phi = hp.pix2ang(nside, np.arange(npix))
+    # Convert to RA, Dec.
+    radecs = astropy.coordinates.SkyCoord(
+        ra=phi * u.rad, dec=(0.5 * np.pi - theta) * u.rad
+    )
+
     observatory_struct = {}
 
     for telescope in params["telescopes"]:
         config_struct = params["config"][telescope]
-
-        observatory = astropy.coordinates.EarthLocation(
-            lat=config_struct["latitude"] * u.deg,
-            lon=config_struct["longitude"] * u.deg,
-            height=config_struct["elevation"] * u.m,
-        )
-
-        # Look up (celestial) spherical polar coordinates of HEALPix grid.
-        theta, phi = hp.pix2ang(nside, np.arange(npix))
-        # Convert to RA, Dec.
-        radecs = astropy.coordinates.SkyCoord(
-            ra=phi * u.rad, dec=(0.5 * np.pi - theta) * u.rad
-        )
+        observatory = config_struct["location"]
 
         observatory_struct[telescope] = {}
         observatory_struct[telescope]["prob"] = copy.deepcopy(map_struct["prob"])
         observatory_struct[telescope]["observability"] = np.zeros((npix,))
         observatory_struct[telescope]["dts"] = {}
 
-        for dt in tqdm(dts):
-            time = event_time + TimeDelta(dt * u.day)
+        # Where is the sun at each time? Computed for all times at once.
+        sun_frame = astropy.coordinates.AltAz(obstime=times, location=observatory)
+        sun_altaz = astropy.coordinates.get_sun(times).transform_to(sun_frame)
+
+        for dt, time, sun_alt in tqdm(zip(dts, times, sun_altaz.alt), total=len(dts)):
+            observatory_struct[telescope]["dts"][dt] = np.zeros((npix,))
+
+            # Nothing is observable unless the sun is at least 18 degrees
+            # below the horizon, so skip transforming the grid
+            if sun_alt > -18 * u.deg:
+                continue
 
             # Alt/az reference frame at observatory, now
             frame = astropy.coordinates.AltAz(obstime=time, location=observatory)
             # Transform grid to alt/az coordinates at observatory, now
             altaz = radecs.transform_to(frame)
 
-            # Where is the sun, now?
-            sun_altaz = astropy.coordinates.get_sun(time).transform_to(altaz)
-
             # How likely is it that the (true, unknown) location of the source
-            # is within the area that is visible, now? Demand that sun is at
-            # least 18 degrees below the horizon and that the airmass
+            # is within the area that is visible, now? Demand that the airmass
             # (secant of zenith angle approximation) is at most 2.5.
-            idx = np.where(
-                (altaz.alt >= 30 * u.deg)
-                & (sun_altaz.alt <= -18 * u.deg)
-                & (altaz.secz <= airmass)
-            )[0]
-            observatory_struct[telescope]["dts"][dt] = np.zeros((npix,))
+            idx = np.where((altaz.alt >= 30 * u.deg) & (altaz.secz <= airmass))[0]
             observatory_struct[telescope]["dts"][dt][idx] = 1
             observatory_struct[telescope]["observability"][idx] = 1
         observatory_struct[telescope]["prob"] = (
@@ -1,7 +1,6 @@
 import glob
 import os
 
-import astroplan
 import astropy
 import numpy as np
 from astropy import table
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import astropy.units as u
 import healpy as hp
 import matplotlib
@@ -7,6 +9,23 @@ from astropy_healpix import HEALPix
 from mocpy import MOC
 
 
+@lru_cache(maxsize=None)
+def get_cached_mollweide_projector(rotation=None):
+    """Returns a Mollweide projector, shared between all tiles using the
+    same (hashable) rotation, as building one is far costlier than using it
+    """
+    return hp.projector.MollweideProj(rot=rotation, coord=None)
+
+
+def get_mollweide_projector(rotation=None):
+    """Returns the shared Mollweide projector for a rotation given as None,
+    a scalar or any sequence of angles
+    """
+    if rotation is not None:
+        rotation = tuple(float(angle) for angle in np.ravel(rotation))
+    return get_cached_mollweide_projector(rotation)
+
+
 def get_ellipse_coords(a=0.0, b=0.0, x=0.0, y=0.0, angle=0.0, npts=10):
     """Draws an ellipse using (360*k + 1) discrete points; based on pseudo code
     given at http://en.wikipedia.org/wiki/Ellipse
@@ -54,7 +73,7 @@ def getRegionPixels(
         ra_pointing, dec_pointing, unit=u.deg
     ).skyoffset_frame()
 
-    proj = hp.projector.MollweideProj(rot=rotation, coord=None)
+    proj = get_mollweide_projector(rotation)
 
     # security for the periodic limit conditions
     ipix = []
@@ -152,7 +171,7 @@ def getCirclePixels(
 
     xyz = hp.ang2vec(radecs[:, 0], radecs[:, 1], lonlat=True)
 
-    proj = hp.projector.MollweideProj(rot=rotation, coord=None)
+    proj = get_mollweide_projector(rotation)
     x, y = proj.vec2xy(xyz[:, 0], xyz[:, 1], xyz[:, 2])
     xy = np.zeros(radecs.shape)
     xy[:, 0] = x
@@ -219,19 +238,14 @@ def getRectanglePixels(
     if len(idx1) > 0:
         radecs = np.delete(radecs, idx1[0], 0)
 
-    xyz = []
-    for r, d in radecs:
-        xyz.append(hp.ang2vec(r, d, lonlat=True))
+    xyz = hp.ang2vec(radecs[:, 0], radecs[:, 1], lonlat=True)
 
     npts, junk = radecs.shape
     if npts == 4:
-        xyz = [xyz[0], xyz[1], xyz[3], xyz[2]]
-        ipix = hp.query_polygon(nside, np.array(xyz))
-    else:
-        ipix = hp.query_polygon(nside, np.array(xyz))
+        xyz = xyz[[0, 1, 3, 2]]
+    ipix = hp.query_polygon(nside, xyz)
 
-    xyz = np.array(xyz)
-    proj = hp.projector.MollweideProj(rot=rotation, coord=None)
+    proj = get_mollweide_projector(rotation)
     x, y = proj.vec2xy(xyz[:, 0], xyz[:, 1], xyz[:, 2])
     xy = np.zeros(radecs.shape)
     xy[:, 0] = x
@@ -295,19 +309,14 @@ def getSquarePixels(
     if len(idx1) > 0:
         radecs = np.delete(radecs, idx1[0], 0)
 
-    xyz = []
-    for r, d in radecs:
-        xyz.append(hp.ang2vec(r, d, lonlat=True))
+    xyz = hp.ang2vec(radecs[:, 0], radecs[:, 1], lonlat=True)
 
     npts, junk = radecs.shape
     if npts == 4:
-        xyz = [xyz[0], xyz[1], xyz[3], xyz[2]]
-        ipix = hp.query_polygon(nside, np.array(xyz))
-    else:
-        ipix = hp.query_polygon(nside, np.array(xyz))
+        xyz = xyz[[0, 1, 3, 2]]
+    ipix = hp.query_polygon(nside, xyz)
 
-    xyz = np.array(xyz)
-    proj = hp.projector.MollweideProj(rot=rotation, coord=None)
+    proj = get_mollweide_projector(rotation)
     x, y = proj.vec2xy(xyz[:, 0], xyz[:, 1], xyz[:, 2])
     xy = np.zeros(radecs.shape)
     xy[:, 0] = x